@@ -1,7 +1,7 @@
 # app.py
 from flask import Flask, request, jsonify
 from openai import OpenAI
-from logic.LLM.ChatAI.config import API_KEY, BASE_URL, MODEL
+from logic.LLM.ChatAI.config import require_api_key, BASE_URL, MODEL
 from PIL import Image
 import pytesseract
 import requests
@@ -9,12 +9,21 @@ import io
 import json
 import re
 from difflib import SequenceMatcher
+import numpy as np
+from logic.my_ml_backend.ocr_page import OcrPage
 
 
 app = Flask(__name__)
 
-# Initialize the SAIA OpenAI-compatible client
-client = OpenAI(api_key=API_KEY, base_url=BASE_URL)
+# SAIA OpenAI-compatible client, created on first use
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=require_api_key(), base_url=BASE_URL)
+    return _client
 
 # ---------- helper: extract text and bounding boxes from image ----------
 def extract_ocr_data(image_url):
@@ -22,16 +31,10 @@ def extract_ocr_data(image_url):
     img = Image.open(io.BytesIO(response.content))
 
     ocr_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-    text_blocks = []
+    ocr = OcrPage.from_tesseract(ocr_data, img.size)
 
-    for i in range(len(ocr_data["text"])):
-        text = ocr_data["text"][i].strip()
-        if text:
-            x, y, w, h = ocr_data["left"][i], ocr_data["top"][i], ocr_data["width"][i], ocr_data["height"][i]
-            text_blocks.append({"text": text, "bbox": [x, y, w, h]})
-
-    full_text = " ".join([b["text"] for b in text_blocks])
-    return full_text, text_blocks, img.size
+    full_text = " ".join(ocr.text)
+    return full_text, ocr
 
 # ---------- helper: ask SAIA model ----------
 
@@ -49,7 +52,7 @@ def ask_model_for_properties(text):
     {text}
     """
 
-    response = client.chat.completions.create(
+    response = get_client().chat.completions.create(
         model=MODEL,
         messages=[
             {"role": "system", "content": "You are a precise extraction assistant."},
@@ -79,9 +82,6 @@ def ask_model_for_properties(text):
 def fuzzy_match(a, b, threshold=0.8):
     return SequenceMatcher(None, a.lower(), b.lower()).ratio() > threshold
 
-def clamp(v):
-    return max(0, min(100, v))
-
 
 # ---------- ML backend endpoints ----------
 @app.route("/predict", methods=["POST"])
@@ -112,7 +112,8 @@ def predict():
     results = []
 
     for page_url in pages:
-        full_text, text_blocks, (img_w, img_h) = extract_ocr_data(page_url)
+        full_text, ocr = extract_ocr_data(page_url)
+        boxes = np.clip(ocr.percent, 0, 100)
         props = ask_model_for_properties(full_text)
 
         with open("response_props.json", "w", encoding="utf-8") as f:
@@ -120,18 +121,18 @@ def predict():
 
         for prop in props:
             for key, value in prop.items():
-                for block in text_blocks:
-                    if fuzzy_match(block["text"], str(value)):
-                        x, y, w, h = block["bbox"]
+                for i, text in enumerate(ocr.text):
+                    if fuzzy_match(text, str(value)):
+                        x, y, w, h = boxes[i].tolist()
                         results.append({
                             "from_name": "rectangles",
                             "to_name": "pdf",
                             "type": "rectanglelabels",
                             "value": {
-                                "x": clamp((x / img_w) * 100),
-                                "y": clamp((y / img_h) * 100),
-                                "width": clamp((w / img_w) * 100),
-                                "height": clamp((h / img_h) * 100),
+                                "x": x,
+                                "y": y,
+                                "width": w,
+                                "height": h,
                                 "rotation": 0,
                                 "rectanglelabels": [key]
                             }
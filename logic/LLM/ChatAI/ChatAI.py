@@ -1,6 +1,6 @@
 import pdfplumber
 from openai import OpenAI
-from config import API_KEY, BASE_URL, DEFAULT_MODEL
+from config import require_api_key, BASE_URL, DEFAULT_MODEL
 
 def pdf_to_text(pdf_path: str) -> str:
     """Extract all text from a PDF file."""
@@ -14,7 +14,7 @@ def pdf_to_text(pdf_path: str) -> str:
 
 def query_model(prompt: str, model: str = DEFAULT_MODEL) -> str:
     """Send a prompt to the SAIA LLM and return the response text."""
-    client = OpenAI(api_key=API_KEY, base_url=BASE_URL)
+    client = OpenAI(api_key=require_api_key(), base_url=BASE_URL)
     response = client.chat.completions.create(
         model=model,
         messages=[
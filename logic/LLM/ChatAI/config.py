@@ -17,12 +17,16 @@ BASE_URL = os.getenv("CHAT_BASE_URL", "https://chat-ai.academiccloud.de/v1")
 MODEL = os.getenv("CHAT_MODEL", "meta-llama-3.1-8b-instruct")
 RAG_MODEL = os.getenv("CHAT_RAG_MODEL", "meta-llama-3.1-8b-rag")
 
-# --- Safety check ---
-if not API_KEY:
-    raise ValueError(f"CHAT_API_KEY not found in {ENV_PATH}")
+
+# --- Safety check (on use, so importing this module never fails) ---
+def require_api_key():
+    """Return the API key, raising if it is not configured."""
+    if not API_KEY:
+        raise ValueError(f"CHAT_API_KEY not found in {ENV_PATH}")
+    return API_KEY
 
 
 if __name__ == "__main__":
-    print("API_KEY:", API_KEY[:6] + "...")
+    print("API_KEY:", require_api_key()[:6] + "...")
     print("BASE_URL:", BASE_URL)
     print("MODEL:", MODEL)
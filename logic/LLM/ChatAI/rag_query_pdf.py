@@ -1,7 +1,7 @@
 import pdfplumber
 import os
 from openai import OpenAI
-from config import API_KEY, BASE_URL, RAG_MODEL
+from config import require_api_key, BASE_URL, RAG_MODEL
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 
@@ -44,7 +44,7 @@ class SimpleRetriever:
 # ---------- 4️⃣ Query the RAG model ----------
 def query_rag_model(question, retrieved_contexts):
     """Send question + context to the model."""
-    client = OpenAI(api_key=API_KEY, base_url=BASE_URL)
+    client = OpenAI(api_key=require_api_key(), base_url=BASE_URL)
 
     context_text = "\n\n".join(retrieved_contexts)
     prompt = f"Use the following document excerpts to answer:\n{context_text}\n\nQuestion: {question}"
@@ -1,6 +1,12 @@
 import os
+import re
+import sys
+import time
+import signal
 import argparse
+import importlib
 import json
+import threading
 import logging
 import logging.config
 
@@ -33,10 +39,14 @@ logging.config.dictConfig({
 })
 
 from label_studio_ml.api import init_app
-from model import NewModel
+from model import NewModel, start_warm_up
 
 
+WARM_UP = os.getenv("WARM_UP", "true").lower() == "true"
 _DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+_MODEL_PATH = os.path.join(os.path.dirname(__file__), 'model.py')
+# Modules re-imported by every worker, so a graceful reload serves the code currently on disk
+_PROJECT_MODULES = ('model', 'json_stream', 'consolidate', 'ocr_page', 'shared_store')
 
 
 def get_kwargs_from_config(config_path=_DEFAULT_CONFIG_PATH):
@@ -48,6 +58,61 @@ def get_kwargs_from_config(config_path=_DEFAULT_CONFIG_PATH):
     return config
 
 
+def read_model_version(model_path=_MODEL_PATH):
+    """MODEL_VERSION as currently written in model.py (read from disk, not from the imported module)."""
+    with open(model_path, encoding="utf-8") as f:
+        match = re.search(r'^MODEL_VERSION\s*=\s*["\']([^"\']+)["\']', f.read(), re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def watch_model_version(server, interval):
+    """Runs in the gunicorn master: gracefully reload all workers when MODEL_VERSION changes."""
+    version = read_model_version()
+    while True:
+        time.sleep(interval)
+        try:
+            current = read_model_version()
+        except OSError:
+            continue
+        if current != version:
+            server.log.info("Model version changed %s -> %s, reloading workers", version, current)
+            version = current
+            # HUP: start workers with the new code, then stop the old ones once they finish their requests
+            os.kill(server.pid, signal.SIGHUP)
+
+
+def run_gunicorn(host, port, workers, threads, reload_interval, basic_auth_user=None, basic_auth_pass=None):
+    """Serve with gunicorn: ``workers`` prefork processes sharing state through shared_store.py."""
+    from gunicorn.app.base import BaseApplication
+
+    def when_ready(server):
+        if reload_interval > 0:
+            threading.Thread(target=watch_model_version, args=(server, reload_interval), daemon=True).start()
+
+    class MLBackendApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('timeout', 0)
+            # Workers import the model themselves (no --preload), so a reload picks up new code
+            self.cfg.set('preload_app', False)
+            self.cfg.set('when_ready', when_ready)
+
+        def load(self):
+            for name in _PROJECT_MODULES:
+                sys.modules.pop(name, None)
+            model = importlib.import_module('model')
+
+            app = init_app(model_class=model.NewModel, basic_auth_user=basic_auth_user,
+                           basic_auth_pass=basic_auth_pass)
+            if WARM_UP:
+                app.before_request(model.start_warm_up)
+            return app
+
+    MLBackendApplication().run()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Label studio')
     parser.add_argument(
@@ -78,6 +143,19 @@ if __name__ == "__main__":
     parser.add_argument('--basic-auth-pass',
                         default=os.environ.get('ML_SERVER_BASIC_AUTH_PASS', None),
                         help='Basic auth pass')    
+    parser.add_argument(
+        '--server', dest='server', choices=['dev', 'gunicorn'], default='dev',
+        help='dev: single-process Flask server; gunicorn: multiple worker processes')
+    parser.add_argument(
+        '--workers', dest='workers', type=int, default=int(os.getenv('WORKERS', os.cpu_count() or 1)),
+        help='Number of worker processes (gunicorn only)')
+    parser.add_argument(
+        '--threads', dest='threads', type=int, default=int(os.getenv('THREADS', 8)),
+        help='Threads per worker process (gunicorn only)')
+    parser.add_argument(
+        '--reload-interval', dest='reload_interval', type=float, default=float(os.getenv('MODEL_RELOAD_INTERVAL', 10)),
+        help='Seconds between checks of MODEL_VERSION in model.py; workers are reloaded gracefully '
+             'when it changes (gunicorn only, 0 disables)')
     
     args = parser.parse_args()
 
@@ -116,10 +194,21 @@ if __name__ == "__main__":
         print('Check "' + NewModel.__name__ + '" instance creation..')
         model = NewModel(**kwargs)
 
+    if args.server == 'gunicorn':
+        run_gunicorn(args.host, args.port, args.workers, args.threads, args.reload_interval,
+                     basic_auth_user=args.basic_auth_user, basic_auth_pass=args.basic_auth_pass)
+        sys.exit(0)
+
     app = init_app(model_class=NewModel, basic_auth_user=args.basic_auth_user, basic_auth_pass=args.basic_auth_pass)
+    if WARM_UP:
+        # Loads Tesseract and the HTTP pool in the background while the server already answers health checks
+        start_warm_up()
 
     app.run(host=args.host, port=args.port, debug=args.debug)
 
 else:
     # for uWSGI use
     app = init_app(model_class=NewModel)
+    if WARM_UP:
+        # Started by the first request of each worker process, so it also works with prefork servers
+        app.before_request(start_warm_up)
@@ -0,0 +1,315 @@
+"""
+Headless batch extraction for whole manual libraries.
+
+Runs the same OCR + LLM + matching pipeline as the Label Studio backend
+(`NewModel.process_page`) over a directory tree such as `files/images/`,
+without going through `/predict`:
+
+    python batch.py ../../files/images --out ./batch_output --concurrency 4
+
+Every sub-directory holding page images (or PDFs) is one document. Pages of all
+documents share one worker pool, so `--concurrency` is a global limit. Each
+finished document is written as its own shard and recorded in
+`checkpoint.jsonl`; re-running the same command skips documents that are
+already done, so interrupted runs resume where they stopped. A document with a
+page that failed (download, OCR or LLM error) is neither written nor
+checkpointed, so the next run retries it.
+
+Output layout:
+
+    <out>/properties/<document>.jsonl|.parquet   consolidated properties with page provenance
+    <out>/tasks/<document>.json                  Label Studio pre-annotation import
+    <out>/checkpoint.jsonl                       finished documents
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from consolidate import PropertyTable, select_regions
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp")
+PDF_EXTENSIONS = (".pdf",)
+PROPERTY_COLUMNS = [
+    "document", "prop-name", "prop-value", "prop-unit", "name", "value", "unit", "pages", "occurrences",
+]
+
+
+# -------------------------------
+# Document discovery
+# -------------------------------
+def _page_number(filename):
+    """Sort key for `<name>_<n>.jpg` page files (natural order, not 1, 10, 11, 2...)."""
+    match = re.search(r"(\d+)$", os.path.splitext(filename)[0])
+    return (int(match.group(1)) if match else -1, filename)
+
+
+def _document_key(document_id):
+    """File-system safe, unique name for a document's output files.
+
+    The hash suffix keeps ids that sanitize to the same name (``a/b`` and ``a_b``) apart.
+    """
+    name = re.sub(r"[^\w.\-]+", "_", document_id).strip("_") or "document"
+    return f"{name}-{hashlib.sha1(document_id.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _pages_from_data_json(directory, images):
+    """Use the hosted page URLs from `data_json.json` and map them to local files."""
+    with open(os.path.join(directory, "data_json.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):  # Label Studio import format: a list of tasks
+        data = data[0] if data else {}
+    data = data.get("data", {})
+
+    pages = []
+    for url in data.get("pages", []):
+        local = os.path.join(directory, os.path.basename(url))
+        pages.append((url, local if os.path.basename(url) in images else None))
+    return data.get("pdf_name"), pages
+
+
+def _pages_from_pdf(pdf_path, cache_dir):
+    """Render a PDF into page images once, reusing them on later runs.
+
+    Pages are rendered into a temporary directory that only becomes ``cache_dir``
+    once all of them are saved, so an interrupted render is redone from scratch.
+    """
+    if not os.path.isdir(cache_dir):
+        from pdf2image import convert_from_path
+
+        tmp_dir = cache_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        name = os.path.splitext(os.path.basename(pdf_path))[0]
+        for i, image in enumerate(convert_from_path(pdf_path)):
+            image.save(os.path.join(tmp_dir, f"{name}_{i + 1}.jpg"), "JPEG")
+        os.replace(tmp_dir, cache_dir)
+
+    rendered = sorted((f for f in os.listdir(cache_dir) if f.lower().endswith(".jpg")), key=_page_number)
+    return [os.path.join(cache_dir, f) for f in rendered]
+
+
+def discover_documents(root, out_dir, host_root=None):
+    """Find documents below ``root``.
+
+    Returns a list of dicts with ``id``, ``name`` and ``pages`` where every page
+    is a ``(page_url, image_source)`` tuple: ``page_url`` ends up in the Label
+    Studio tasks, ``image_source`` is what gets OCR'd.
+    """
+    root = os.path.abspath(root)
+    documents = []
+
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        rel_dir = os.path.relpath(directory, root)
+        images = sorted((f for f in filenames if f.lower().endswith(IMAGE_EXTENSIONS)), key=_page_number)
+
+        if images:
+            name = os.path.basename(directory)
+            if "data_json.json" in filenames:
+                name, pages = _pages_from_data_json(directory, images)
+                name = name or os.path.basename(directory)
+            else:
+                pages = []
+                for image in images:
+                    local = os.path.join(directory, image)
+                    url = f"{host_root}/{rel_dir}/{image}".replace(os.sep, "/") if host_root else local
+                    pages.append((url, local))
+            documents.append({"id": rel_dir, "name": name, "pages": pages})
+            continue
+
+        # No rendered pages: every PDF in this directory is a document of its own
+        for pdf in sorted(f for f in filenames if f.lower().endswith(PDF_EXTENSIONS)):
+            doc_id = os.path.join(rel_dir, os.path.splitext(pdf)[0])
+            cache_dir = os.path.join(out_dir, "pages", _document_key(doc_id))
+            try:
+                rendered = _pages_from_pdf(os.path.join(directory, pdf), cache_dir)
+            except Exception as e:
+                print(f"❌ Could not render {pdf}: {e}")
+                continue
+            documents.append({
+                "id": doc_id,
+                "name": os.path.splitext(pdf)[0],
+                "pages": [(path, path) for path in rendered],
+            })
+
+    return documents
+
+
+# -------------------------------
+# Checkpoint + output
+# -------------------------------
+def load_checkpoint(out_dir):
+    """Return the ids of documents finished by previous runs."""
+    path = os.path.join(out_dir, "checkpoint.jsonl")
+    done = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    done.add(json.loads(line)["document"])
+    return done
+
+
+def _write_atomic(path, write):
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_properties(path, rows, fmt):
+    """Write property rows as a JSONL or Parquet shard."""
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({col: [row.get(col) for row in rows] for col in PROPERTY_COLUMNS})
+        _write_atomic(path, lambda tmp: pq.write_table(table, tmp))
+        return
+
+    def write_jsonl(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    _write_atomic(path, write_jsonl)
+
+
+def write_document(out_dir, document, page_outputs, table, model, fmt):
+    """Persist one finished document and mark it as done in the checkpoint."""
+    key = _document_key(document["id"])
+    rows = [{"document": document["id"], **row} for row in table.rows()]
+
+    candidates = []
+    for page_index in range(len(document["pages"])):
+        candidates.extend(page_outputs.get(page_index, ([], []))[1])
+    results = select_regions(candidates, model.max_regions_per_property, model.max_regions_per_task)
+
+    write_properties(os.path.join(out_dir, "properties", f"{key}.{fmt}"), rows, fmt)
+
+    task = {
+        "data": {"pdf_name": document["name"], "pages": [url for url, _ in document["pages"]]},
+        "predictions": [{"model_version": model.get("model_version"), "result": results}],
+    }
+
+    def write_task(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([task], f, indent=2, ensure_ascii=False)
+
+    _write_atomic(os.path.join(out_dir, "tasks", f"{key}.json"), write_task)
+
+    with open(os.path.join(out_dir, "checkpoint.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "document": document["id"],
+            "pages": len(document["pages"]),
+            "properties": len(rows),
+            "regions": len(results),
+        }, ensure_ascii=False) + "\n")
+
+    print(f"💾 Saved '{document['id']}': {len(rows)} properties, {len(results)} regions.")
+
+
+# -------------------------------
+# Runner
+# -------------------------------
+def _is_rate_limit(error):
+    """True for openai's RateLimitError (if openai was never imported, it cannot be one)."""
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(error, openai.RateLimitError)
+
+
+def run(root, out_dir, concurrency=4, fmt="jsonl", host_root=None, model=None):
+    """Process every pending document below ``root``. Returns the number of documents finished."""
+    if fmt == "parquet":
+        # Fail before any page is OCR'd or sent to the LLM, not when the first shard is written
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ImportError("--format parquet requires pyarrow (pip install pyarrow)") from e
+
+    os.makedirs(os.path.join(out_dir, "properties"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "tasks"), exist_ok=True)
+
+    done = load_checkpoint(out_dir)
+    documents = [d for d in discover_documents(root, out_dir, host_root) if d["id"] not in done]
+    print(f"📚 {len(documents)} document(s) to process ({len(done)} already done).")
+    if not documents:
+        return 0
+
+    if model is None:
+        from model import NewModel
+        model = NewModel()
+
+    outputs = {doc["id"]: {} for doc in documents}
+    tables = {doc["id"]: PropertyTable() for doc in documents}
+    remaining = {doc["id"]: len(doc["pages"]) for doc in documents}
+    failed = set()
+    finished = 0
+
+    # Documents without pages are finished right away
+    for doc in documents:
+        if not doc["pages"]:
+            write_document(out_dir, doc, {}, tables[doc["id"]], model, fmt)
+            finished += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {}
+        for doc in documents:
+            for page_index, (page_url, image_source) in enumerate(doc["pages"]):
+                future = pool.submit(
+                    model.process_page, page_index, page_url, image_source, tables[doc["id"]], strict=True
+                )
+                futures[future] = (doc, page_index)
+
+        for future in as_completed(futures):
+            doc, page_index = futures[future]
+            try:
+                outputs[doc["id"]][page_index] = future.result()
+            except Exception as e:
+                if _is_rate_limit(e):
+                    print("🚫 All API keys exhausted — stopping; re-run the same command to resume.")
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                print(f"❌ Page {page_index + 1} of '{doc['id']}' failed, the document will be retried: {e}")
+                failed.add(doc["id"])
+
+            remaining[doc["id"]] -= 1
+            if remaining[doc["id"]] == 0 and doc["id"] not in failed:
+                write_document(out_dir, doc, outputs.pop(doc["id"]), tables.pop(doc["id"]), model, fmt)
+                finished += 1
+
+    if failed:
+        print(f"⚠️ {len(failed)} document(s) had failed pages and were not saved; re-run to retry them.")
+    print(f"✅ Finished {finished}/{len(documents)} document(s). Output in {out_dir}")
+    return finished
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Headless OCR + ChatAI property extraction for a manual library')
+    parser.add_argument(
+        'root',
+        help='Directory tree with one sub-directory of page images (or PDFs) per document, e.g. files/images')
+    parser.add_argument(
+        '-o', '--out', dest='out', default='batch_output',
+        help='Output directory (also holds the checkpoint used for resuming)')
+    parser.add_argument(
+        '-c', '--concurrency', dest='concurrency', type=int, default=int(os.getenv("BATCH_CONCURRENCY", 4)),
+        help='Maximum number of pages processed at the same time, across all documents')
+    parser.add_argument(
+        '--format', dest='fmt', choices=['jsonl', 'parquet'], default='jsonl',
+        help='Format of the property shards (parquet requires pyarrow)')
+    parser.add_argument(
+        '--host-root', dest='host_root', default=None,
+        help='Base URL the images are served from (e.g. http://host.docker.internal:9900/images), '
+             'used for documents without data_json.json')
+    args = parser.parse_args()
+
+    run(args.root, args.out, concurrency=args.concurrency, fmt=args.fmt, host_root=args.host_root)
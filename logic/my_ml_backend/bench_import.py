@@ -0,0 +1,76 @@
+"""
+Import-time benchmark for the ML backend's cold start.
+
+Every measurement runs in a fresh interpreter, so nothing is cached in
+`sys.modules`:
+
+    python bench_import.py              # import `model` / `_wsgi` vs. the heavy dependencies
+    python bench_import.py --top 15     # also list the slowest modules behind `import model`
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TARGETS = {
+    "model": "import model",
+    "_wsgi (app ready)": "import _wsgi",
+    "openai": "import openai",
+    "pytesseract + PIL": "import pytesseract, PIL.Image",
+    "requests": "import requests",
+    "label_studio_ml": "import label_studio_ml.model",
+}
+
+
+def time_import(statement, repeat):
+    """Median wall time (seconds) of ``statement`` in fresh interpreters, or None if it fails."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def slowest_modules(statement, top):
+    """``(cumulative µs, module)`` pairs from ``python -X importtime``, slowest first."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=HERE,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), module))
+    return sorted(rows, reverse=True)[:top]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure the import time of the ML backend')
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int, default=5,
+                        help='Fresh interpreters per measurement (median is reported)')
+    parser.add_argument('--top', dest='top', type=int, default=0,
+                        help='Also list the N slowest modules imported by `import model`')
+    args = parser.parse_args()
+
+    print(f"⏱️ Import times (median of {args.repeat} fresh interpreters):")
+    for label, statement in TARGETS.items():
+        seconds = time_import(statement, args.repeat)
+        shown = f"{seconds * 1000:8.1f} ms" if seconds is not None else "  failed (missing dependency?)"
+        print(f"  {label:<20} {shown}")
+
+    if args.top:
+        print(f"\n🐢 Slowest modules behind `import model`:")
+        for cumulative, module in slowest_modules("import model", args.top):
+            print(f"  {cumulative / 1000:8.1f} ms  {module}")
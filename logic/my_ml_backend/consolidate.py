@@ -0,0 +1,196 @@
+"""
+Consolidation of extracted properties.
+
+The LLM returns raw (name, value, unit) triples per page, so the same property
+shows up many times across a manual with different spellings ("Battery
+capacity 5 Ah" on one page, "battery 5000 mAh" on another). This module
+normalizes names and units (synonym maps + unit conversion table) and merges
+duplicates into one per-document `PropertyTable` that keeps track of the pages
+each property was seen on. `select_regions` then picks the rectangles to emit
+for the whole document from all match candidates, so the caps do not depend
+on the order in which pages finished.
+"""
+
+import re
+import threading
+from decimal import Decimal, InvalidOperation
+
+
+# Spelling variants -> canonical unit
+UNIT_SYNONYMS = {
+    "millimeter": "mm", "millimeters": "mm", "millimetre": "mm", "millimetres": "mm",
+    "centimeter": "cm", "centimeters": "cm", "centimetre": "cm", "centimetres": "cm",
+    "meter": "m", "meters": "m", "metre": "m", "metres": "m",
+    "inches": "inch", "in": "inch", '"': "inch", "″": "inch", "”": "inch", "zoll": "inch",
+    "gram": "g", "grams": "g", "kilogram": "kg", "kilograms": "kg", "kilo": "kg",
+    "watt": "w", "watts": "w", "kilowatt": "kw", "kilowatts": "kw",
+    "volt": "v", "volts": "v", "ampere": "a", "amps": "a", "amp": "a",
+    "hertz": "hz", "u/min": "rpm", "1/min": "rpm", "min-1": "rpm", "revolutions per minute": "rpm",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l",
+    "gigabyte": "gb", "gigabytes": "gb", "terabyte": "tb", "terabytes": "tb", "megabyte": "mb", "megabytes": "mb",
+    "megapixel": "mp", "megapixels": "mp",
+    "degrees celsius": "°c", "celsius": "°c", "degree celsius": "°c",
+    "hours": "h", "hour": "h", "hrs": "h", "minutes": "min", "seconds": "s", "sec": "s",
+}
+
+# Unit -> (base unit, factor), so "0.5 m" and "500 mm" end up as the same property
+UNIT_CONVERSIONS = {
+    "cm": ("mm", 10),
+    "m": ("mm", 1000),
+    "kg": ("g", 1000),
+    "kw": ("w", 1000),
+    "ah": ("mah", 1000),
+    "khz": ("hz", 1e3),
+    "mhz": ("hz", 1e6),
+    "ghz": ("hz", 1e9),
+    "tb": ("gb", 1000),
+    "mb": ("gb", 0.001),
+    "l": ("ml", 1000),
+    "kwh": ("wh", 1000),
+}
+
+# Spelling variants -> canonical property name
+NAME_SYNONYMS = {
+    "wi-fi": "wifi", "wlan": "wifi", "wireless lan": "wifi",
+    "battery capacity": "battery", "battery size": "battery",
+    "display size": "screen size", "screen diagonal": "screen size", "display diagonal": "screen size",
+    "display resolution": "resolution", "screen resolution": "resolution",
+    "net weight": "weight",
+    "max spin speed": "spin speed", "maximum spin speed": "spin speed",
+    "ram": "memory", "storage capacity": "storage",
+    "rated voltage": "voltage", "rated power": "power", "power consumption": "power",
+}
+
+
+def normalize_name(name):
+    """Lowercase, drop punctuation around the name, collapse whitespace and apply the synonym map."""
+    name = re.sub(r"[_\s]+", " ", str(name).lower()).strip(" :.-")
+    return NAME_SYNONYMS.get(name, name)
+
+
+def normalize_unit(unit):
+    unit = re.sub(r"\s+", " ", str(unit).lower()).strip(" .")
+    return UNIT_SYNONYMS.get(unit, unit)
+
+
+def _parse_number(value):
+    """Exact number for ``value`` or None; a comma is a decimal point only in e.g. "0,5".
+
+    "1,500" or "1,024.5" use the comma as thousands separator; anything else with
+    a comma (e.g. "1.234,5") is ambiguous and left alone.
+    """
+    if "," in value:
+        if "." not in value and re.fullmatch(r"[-+]?\d+,\d+", value) and not re.search(r",\d{3}$", value):
+            value = value.replace(",", ".")
+        elif re.fullmatch(r"[-+]?\d{1,3}(,\d{3})+(\.\d+)?", value):
+            value = value.replace(",", "")
+        else:
+            return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+def normalize_value_unit(value, unit):
+    """Return ``(value, unit)`` in canonical form, converting numeric values to the base unit.
+
+    The value is only rewritten when a conversion applies; the arithmetic is exact
+    (`Decimal`), so distinct long numbers never collapse into the same key.
+    """
+    value = re.sub(r"\s+", " ", str(value).lower()).strip()
+    unit = normalize_unit(unit)
+
+    if unit not in UNIT_CONVERSIONS:
+        return value, unit
+    number = _parse_number(value)
+    if number is None:
+        return value, unit
+    base_unit, factor = UNIT_CONVERSIONS[unit]
+    return format((number * Decimal(str(factor))).normalize(), "f"), base_unit
+
+
+def property_key(prop):
+    """Key under which duplicates of the same property are merged."""
+    value, unit = normalize_value_unit(prop.get("prop-value", ""), prop.get("prop-unit", ""))
+    return normalize_name(prop.get("prop-name", "")), value, unit
+
+
+class PropertyTable:
+    """Per-document table of consolidated properties with page provenance.
+
+    Safe to share between the threads processing the pages of one document.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def add(self, prop, page_index):
+        """Merge ``prop`` found on ``page_index`` into the table and return its record."""
+        key = property_key(prop)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                name, value, unit = key
+                record = self._records[key] = {
+                    "prop-name": prop.get("prop-name", ""),
+                    "prop-value": prop.get("prop-value", ""),
+                    "prop-unit": prop.get("prop-unit", ""),
+                    "name": name,
+                    "value": value,
+                    "unit": unit,
+                    "pages": [],
+                    "occurrences": 0,
+                }
+            record["occurrences"] += 1
+            if page_index not in record["pages"]:
+                record["pages"].append(page_index)
+            return record
+
+    def rows(self):
+        """Consolidated properties, most frequent first."""
+        with self._lock:
+            records = sorted(self._records.values(), key=lambda r: (-r["occurrences"], min(r["pages"])))
+            return [r | {"pages": sorted(r["pages"])} for r in records]
+
+    def __len__(self):
+        return len(self._records)
+
+
+def select_regions(candidates, per_property, per_task):
+    """Pick the rectangles to emit for one document from all its match candidates.
+
+    Every candidate is a dict with the consolidated ``property`` key, its
+    ``context`` (name/unit found on the same line), ``score``, ``page``, the
+    ``word`` index of the value and the ``regions`` it would emit as
+    ``(page, word, label, region)`` tuples. Per property the ``per_property``
+    best candidates are kept, ranked by (context, score, page); bare hits are
+    dropped once a hit with context exists. Of the resulting rectangles at most
+    ``per_task`` are kept, the best scored ones. Returns them in page order.
+    """
+    by_property = {}
+    for candidate in candidates:
+        by_property.setdefault(candidate["property"], []).append(candidate)
+
+    chosen = []
+    for group in by_property.values():
+        if any(c["context"] for c in group):
+            # Bare hits of common values ("1", "2") are noise once a hit with context exists
+            group = [c for c in group if c["context"]]
+        group.sort(key=lambda c: (-c["context"], -c["score"], c["page"], c["word"]))
+        chosen.extend(group[:per_property])
+    chosen.sort(key=lambda c: (c["page"], c["word"]))
+
+    results, seen = [], set()
+    for candidate in chosen:
+        for page, word, label, region in candidate["regions"]:
+            if (page, word, label) not in seen:
+                seen.add((page, word, label))
+                results.append(region)
+
+    if len(results) > per_task:
+        keep = sorted(range(len(results)), key=lambda i: results[i]["score"], reverse=True)
+        results = [results[i] for i in sorted(keep[:per_task])]
+    return results
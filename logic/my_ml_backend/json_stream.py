@@ -0,0 +1,88 @@
+"""
+Incremental parser for property lists streamed by the LLM.
+
+The model is asked for a JSON list of flat property objects, either bare
+(`[{...}, {...}]`) or wrapped in an object in JSON mode (`{"properties": [...]}`).
+Instead of waiting for the whole completion and parsing it in one go, the
+parser is fed text chunks as they arrive and yields every flat object as soon
+as its closing brace is seen. Leading/trailing chatter is ignored and a
+truncated completion still yields all objects that were complete. Only
+property objects are yielded: an empty JSON-mode answer (`{"properties": []}`)
+or a stray `{}` produces nothing.
+"""
+
+import json
+
+
+PROPERTY_KEYS = ("prop-name", "prop-value")
+
+
+def is_property(item):
+    """True for a property object: a dict with a name or value and only scalar values."""
+    return (
+        isinstance(item, dict)
+        and any(key in item for key in PROPERTY_KEYS)
+        and all(v is None or isinstance(v, (str, int, float, bool)) for v in item.values())
+    )
+
+
+class PropertyStreamParser:
+    """Yield flat property objects (objects without nested objects) from streamed text."""
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._stack = []  # [start offset, has nested object] for every open "{"
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """Consume the next chunk of model output and return the objects it completed."""
+        self._text += chunk
+        items = []
+
+        while self._pos < len(self._text):
+            ch = self._text[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._stack:
+                # Quotes only matter inside objects; prose around the JSON may contain stray ones
+                self._in_string = True
+            elif ch == "{":
+                if self._stack:
+                    self._stack[-1][1] = True
+                self._stack.append([self._pos, False])
+            elif ch == "}" and self._stack:
+                start, has_nested = self._stack.pop()
+                if not has_nested:
+                    item = self._load(self._text[start:self._pos + 1])
+                    if item is not None:
+                        items.append(item)
+
+            self._pos += 1
+
+        # Nothing open anymore: the consumed text is no longer needed
+        if not self._stack:
+            self._text = ""
+            self._pos = 0
+
+        return items
+
+    @staticmethod
+    def _load(candidate):
+        try:
+            item = json.loads(candidate)
+        except ValueError:
+            return None
+        return item if is_property(item) else None
+
+
+def parse_properties(text):
+    """Parse a complete (possibly truncated or chatty) model output into property objects."""
+    return PropertyStreamParser().feed(text)
@@ -1,14 +1,110 @@
-import json
 import os
-import re
+import json
+import time
+import hashlib
 import difflib
-import requests
+import threading
 from io import BytesIO
-from PIL import Image, ImageOps
-import pytesseract
-from openai import OpenAI, RateLimitError
 from label_studio_ml.model import LabelStudioMLBase
 from label_studio_ml.response import ModelResponse
+from json_stream import PropertyStreamParser
+from consolidate import PropertyTable, select_regions
+from shared_store import get_store
+
+# openai, pytesseract, PIL, requests and numpy (ocr_page) are imported on first use: importing them
+# dominates the cold start, and e.g. /health never needs them. label_studio_ml stays eager: NewModel
+# subclasses LabelStudioMLBase and the app serving /health is built from it.
+
+MODEL_VERSION = "1.4.0"
+DEFAULT_BASE_URL = "https://chat-ai.academiccloud.de/v1"
+
+_clients = {}
+_openai_http_client = None
+_http_session = None
+_shared_lock = threading.Lock()
+_warm_up_pid = None
+
+
+def _openai():
+    """The `openai` module, imported on first use."""
+    import openai
+    return openai
+
+
+def load_api_keys():
+    """API keys from the environment, in rotation order."""
+    keys = [
+        os.getenv("CHAT_API_KEY"),
+        os.getenv("CHAT_API_KEY1"),
+        os.getenv("CHAT_API_KEY2")
+    ]
+    return [k for k in keys if k]  # filter out None or empty
+
+
+def get_openai_http_client():
+    """Process-wide HTTP connection pool shared by the OpenAI clients of all API keys."""
+    global _openai_http_client
+    with _shared_lock:
+        if _openai_http_client is None:
+            _openai_http_client = _openai().DefaultHttpxClient()
+        return _openai_http_client
+
+
+def get_client(api_key, base_url):
+    """Process-wide OpenAI client per API key, so its HTTP connection pool is reused across requests."""
+    http_client = get_openai_http_client()
+    with _shared_lock:
+        client = _clients.get((api_key, base_url))
+        if client is None:
+            client = _openai().OpenAI(api_key=api_key, base_url=base_url, timeout=1800, http_client=http_client)
+            _clients[(api_key, base_url)] = client
+        return client
+
+
+def get_http_session():
+    """Process-wide `requests` session used to download page images."""
+    global _http_session
+    with _shared_lock:
+        if _http_session is None:
+            import requests
+            _http_session = requests.Session()
+        return _http_session
+
+
+def warm_up():
+    """Pre-load Tesseract, the image stack and the API client/HTTP pool."""
+    start = time.perf_counter()
+    try:
+        import pytesseract
+        from PIL import Image, ImageOps  # noqa: F401
+
+        print(f"🔥 Warm-up: Tesseract {pytesseract.get_tesseract_version()}")
+        get_http_session()
+
+        keys = load_api_keys()
+        if keys:
+            base_url = os.getenv("CHAT_BASE_URL", DEFAULT_BASE_URL)
+            index = min(int(get_store().get_state("api_key_index", 0)), len(keys) - 1)
+            get_client(keys[index], base_url)
+            # An unauthenticated request opens the connection the API calls reuse, without touching any key's quota
+            get_openai_http_client().head(base_url)
+    except Exception as e:
+        print(f"⚠️ Warm-up incomplete: {e}")
+    print(f"🔥 Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+
+def start_warm_up():
+    """Run `warm_up` in a background thread, once per process.
+
+    Safe to register as a Flask ``before_request`` hook: with prefork servers the
+    first request of every worker (usually a health check) starts its warm-up.
+    """
+    global _warm_up_pid
+    with _shared_lock:
+        if _warm_up_pid == os.getpid():
+            return
+        _warm_up_pid = os.getpid()
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
 
 
 class NewModel(LabelStudioMLBase):
@@ -16,132 +112,390 @@ class NewModel(LabelStudioMLBase):
 
     def setup(self):
         """Initialize model and API clients with key rotation support."""
-        self.set("model_version", "1.4.0")
+        self.set("model_version", MODEL_VERSION)
 
         # Load multiple API keys
-        keys = [
-            os.getenv("CHAT_API_KEY"),
-            os.getenv("CHAT_API_KEY1"),
-            os.getenv("CHAT_API_KEY2")
-        ]
-        self.api_keys = [k for k in keys if k]  # filter out None or empty
+        self.api_keys = load_api_keys()
         if not self.api_keys:
             raise ValueError("❌ No valid CHAT_API_KEY found in environment")
 
-        self.current_key_index = 0
+        # The active key index is shared by all worker processes (see shared_store.py)
+        self.key_reset_seconds = int(os.getenv("KEY_RESET_SECONDS", 3600))
+        self._key_lock = threading.Lock()
+        if get_store().get_state("api_key_index") is None:
+            get_store().compare_and_set("api_key_index", None, 0)
+        self.current_key_index = self._shared_key_index()
 
-        self.base_url = os.getenv("CHAT_BASE_URL", "https://chat-ai.academiccloud.de/v1")
+        self.base_url = os.getenv("CHAT_BASE_URL", DEFAULT_BASE_URL)
         self.model_name = os.getenv("CHAT_MODEL", "meta-llama-3.1-8b-instruct")
-
-        # Initialize first client
-        self.client = OpenAI(api_key=self.api_keys[self.current_key_index], base_url=self.base_url, timeout=1800)
+        # Request structured JSON output; switched off automatically if the endpoint rejects it
+        self.json_mode = os.getenv("CHAT_JSON_MODE", "true").lower() == "true"
+
+        # Caps on emitted rectangles (per consolidated property per document / per task)
+        self.max_regions_per_property = int(os.getenv("MAX_REGIONS_PER_PROPERTY", 3))
+        self.max_regions_per_task = int(os.getenv("MAX_REGIONS_PER_TASK", 300))
+        # Words with a lower Tesseract confidence (0-100) are dropped from the OCR result
+        self.ocr_min_conf = float(os.getenv("OCR_MIN_CONF", 0))
+        # OCR results and LLM answers are cached in the shared store
+        self.cache_enabled = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+
+        # The client itself is created on first use (see `client`)
         print(f"✅ Model initialized: {self.model_name} at {self.base_url}")
         print(f"🔑 Using API key #{self.current_key_index + 1}/{len(self.api_keys)}")
 
+    @property
+    def client(self):
+        """OpenAI client for the current API key."""
+        return get_client(self.api_keys[self.current_key_index], self.base_url)
+
     # -------------------------------
     # Helper: rotate to next API key
     # -------------------------------
-    def _switch_api_key(self):
-        """Switch to the next available API key when rate limit is hit."""
-        if self.current_key_index + 1 < len(self.api_keys):
-            self.current_key_index += 1
-            new_key = self.api_keys[self.current_key_index]
-            self.client = OpenAI(api_key=new_key, base_url=self.base_url, timeout=1800)
-            print(f"🔁 Switched to API key #{self.current_key_index + 1}/{len(self.api_keys)}")
-            return True
-        else:
-            print("🚫 All API keys exhausted — stopping predictions.")
-            return False
+    def _shared_key_index(self):
+        """Key index currently used by all workers; back to the first key after ``KEY_RESET_SECONDS``."""
+        store = get_store()
+        index = int(store.get_state("api_key_index", 0))
+        switched_at = float(store.get_state("api_key_switched_at", 0))
+        if index and time.time() - switched_at > self.key_reset_seconds:
+            if store.compare_and_set("api_key_index", index, 0):
+                print("🔑 Rate limit window passed — back to API key #1")
+            index = int(store.get_state("api_key_index", 0))
+        return min(index, len(self.api_keys) - 1)
+
+    def _switch_api_key(self, failed_index=None):
+        """Switch to the next available API key when rate limit is hit.
+
+        ``failed_index`` is the key the caller was using. The switch is recorded in
+        the shared store, so every worker moves on together; if another thread or
+        worker already rotated away from it, its choice is adopted instead of
+        skipping a key.
+        """
+        with self._key_lock:
+            if failed_index is None:
+                failed_index = self.current_key_index
+            store = get_store()
+            if failed_index + 1 < len(self.api_keys):
+                if store.compare_and_set("api_key_index", failed_index, failed_index + 1):
+                    store.set_state("api_key_switched_at", time.time())
+
+            shared_index = self._shared_key_index()
+            if shared_index != failed_index:
+                self.current_key_index = shared_index
+                print(f"🔁 Switched to API key #{self.current_key_index + 1}/{len(self.api_keys)}")
+                return True
+            else:
+                print("🚫 All API keys exhausted — stopping predictions.")
+                return False
 
     # -------------------------------
     # OCR Section
     # -------------------------------
+    def _read_image_bytes(self, source):
+        """Raw bytes of a page image from an URL or a local file path."""
+        if source.startswith(("http://", "https://")):
+            response = get_http_session().get(source, timeout=30)
+            response.raise_for_status()
+            return response.content
+        with open(source, "rb") as f:
+            return f.read()
+
     def _ocr_image(self, image_url):
-        """Perform OCR on a given image URL."""
+        """Perform OCR on a given image URL or local image path."""
         print(f"🔍 Running OCR for image: {image_url}")
 
-        response = requests.get(image_url, timeout=30)
-        response.raise_for_status()
+        import pytesseract
+        from PIL import Image, ImageOps
+        from ocr_page import OcrPage
+
+        # Keyed on the image content: a re-rendered page under the same URL is OCR'd again
+        data = self._read_image_bytes(image_url)
+        cache_key = hashlib.sha256(data + f"|{self.ocr_min_conf}".encode()).hexdigest()
+        if self.cache_enabled:
+            cached = get_store().cache_get("ocr", cache_key)
+            if cached is not None:
+                print(f"♻️ OCR cache hit for image: {image_url}")
+                return OcrPage.from_bytes(cached)
 
-        image = Image.open(BytesIO(response.content))
-        image = ImageOps.exif_transpose(image)
+        image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
 
         text_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-        blocks = []
-        for i, txt in enumerate(text_data["text"]):
-            txt = txt.strip()
-            if not txt:
-                continue
-            blocks.append({
-                "text": txt,
-                "bbox": (
-                    text_data["left"][i],
-                    text_data["top"][i],
-                    text_data["width"][i],
-                    text_data["height"][i]
-                )
-            })
+        ocr = OcrPage.from_tesseract(text_data, image.size, min_conf=self.ocr_min_conf)
+        if self.cache_enabled:
+            get_store().cache_put("ocr", cache_key, ocr.to_bytes())
 
-        full_text = "\n".join(b["text"] for b in blocks)
-        print(f"🧾 OCR extracted {len(blocks)} text blocks.")
-        return full_text, blocks, image.size
+        print(f"🧾 OCR extracted {len(ocr)} text blocks.")
+        return ocr
 
     # -------------------------------
     # LLM Section
     # -------------------------------
-    def _ask_model_for_properties(self, text):
-        """Ask the ChatAI model to extract property triples from text."""
-        prompt = f"""
+    def _build_prompt(self, text):
+        """Build the extraction prompt; in JSON mode the list is wrapped in an object."""
+        battery = '{"prop-name": "Battery", "prop-value": "5000", "prop-unit": "mAh"}'
+        screen = '{"prop-name": "Screen size", "prop-value": "6.2", "prop-unit": "inch"}'
+        if self.json_mode:
+            shape = 'a *pure JSON object* with one key, "properties", holding the list of properties'
+            example = f"""{{
+          "properties": [
+            {battery},
+            {screen}
+          ]
+        }}"""
+        else:
+            shape = "a *pure JSON list*"
+            example = f"""[
+          {battery},
+          {screen}
+        ]"""
+        return f"""
         Extract all technical properties (name, value, and unit) from the following text.
-        Return them as a *pure JSON list*, with keys: "prop-name", "prop-value", "prop-unit".
+        Return them as {shape}; every property has the keys "prop-name", "prop-value", "prop-unit".
         Do not include explanations or markdown fences.
         Things like Wifi, Bluetooth, or HDMI count as prop names.
         Example:
-        [
-          {{"prop-name": "Battery", "prop-value": "5000", "prop-unit": "mAh"}},
-          {{"prop-name": "Screen size", "prop-value": "6.2", "prop-unit": "inch"}}
-        ]
+        {example}
 
         Text:
         {text}
         """
 
+    def _create_completion_stream(self, text):
+        """Start a streamed completion, requesting JSON mode where the endpoint supports it."""
+        kwargs = dict(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": "You are a precise information extraction assistant."},
+                {"role": "user", "content": self._build_prompt(text)}
+            ],
+            temperature=0.1,
+            timeout=1800,
+            stream=True,
+        )
+        if not self.json_mode:
+            return self.client.chat.completions.create(**kwargs)
+
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a precise information extraction assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                timeout=1800,
-            )
-
-            raw_output = response.choices[0].message.content.strip()
-
-            # --- Attempt to extract JSON safely ---
-            match = re.search(r'\[.*\]', raw_output, re.DOTALL)
-            json_str = match.group(0) if match else raw_output
-            data = json.loads(json_str)
-
-            # Normalize values
-            for p in data:
-                for k, v in p.items():
-                    p[k] = str(v).strip() if v is not None else ""
-
-            print(f"✅ Parsed {len(data)} properties from model output.")
-            return data
-
-        except RateLimitError:
-            print(f"🚫 API rate limit reached for key #{self.current_key_index + 1}")
-            if self._switch_api_key():
-                # Try again once with the new key
-                return self._ask_model_for_properties(text)
+            return self.client.chat.completions.create(response_format={"type": "json_object"}, **kwargs)
+        except _openai().BadRequestError as e:
+            # Other 400s (e.g. the page exceeding the context length) are not fixed by dropping JSON mode
+            details = f"{getattr(e, 'param', None) or ''} {e}".lower()
+            if "response_format" not in details and "json_object" not in details:
+                raise
+            print(f"⚠️ Endpoint rejected JSON mode, falling back to plain output: {e}")
+            self.json_mode = False
+            kwargs["messages"][1]["content"] = self._build_prompt(text)
+            return self.client.chat.completions.create(**kwargs)
+
+    def _stream_properties(self, text, strict=False, yielded=()):
+        """Yield property triples from the ChatAI model as soon as each one is complete.
+
+        Items are parsed incrementally from the streamed completion, so a truncated
+        or chatty answer still yields every complete property. After a rate limit
+        the request is retried with the next API key; the new answer is yielded in
+        full, except for exact repeats of the ``yielded`` items from the failed one.
+        With ``strict`` a failing request or broken stream is raised instead of
+        ending the answer early.
+        """
+        cache_key = hashlib.sha256(
+            json.dumps([MODEL_VERSION, self.model_name, self.json_mode, text]).encode()
+        ).hexdigest()
+        if self.cache_enabled and not yielded:
+            cached = get_store().cache_get("llm", cache_key)
+            if cached is not None:
+                items = json.loads(cached)
+                print(f"♻️ LLM cache hit: {len(items)} properties.")
+                yield from items
+                return
+
+        key_index = self.current_key_index
+        parser = PropertyStreamParser()
+        repeats = list(yielded)
+        items, emitted = [], []
+        count = 0
+        finish_reason = None
+
+        try:
+            stream = self._create_completion_stream(text)
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                delta = choice.delta.content
+                if not delta:
+                    continue
+
+                for item in parser.feed(delta):
+                    # Normalize values
+                    item = {k: str(v).strip() if v is not None else "" for k, v in item.items()}
+                    items.append(item)
+                    count += 1
+                    if item in repeats:
+                        repeats.remove(item)
+                        continue
+                    emitted.append(item)
+                    yield item
+
+            # Only complete answers are cached: a truncated or unparsable one is worth a retry
+            if finish_reason != "stop" or not items:
+                print(f"⚠️ Model answer not cached (finish_reason={finish_reason}, {len(items)} properties).")
+            elif self.cache_enabled:
+                get_store().cache_put("llm", cache_key, json.dumps(items))
+
+        except _openai().RateLimitError:
+            print(f"🚫 API rate limit reached for key #{key_index + 1}")
+            if self._switch_api_key(key_index):
+                # Try again with the new key; its answer may differ, so only exact repeats are dropped
+                yield from self._stream_properties(text, strict=strict, yielded=list(yielded) + emitted)
+                return
             else:
                 raise  # All keys exhausted → handled in predict()
         except Exception as e:
-            print(f"⚠️ Could not parse model output: {e}")
-            return []
+            print(f"⚠️ Model output stream failed after {count} properties: {e}")
+            if strict:
+                raise
+
+        print(f"✅ Parsed {count} properties from model output.")
+
+    def _ask_model_for_properties(self, text):
+        """Ask the ChatAI model to extract property triples from text."""
+        return list(self._stream_properties(text))
+
+    # -------------------------------
+    # Matching Section
+    # -------------------------------
+    @staticmethod
+    def _similarity(a, b):
+        """Fuzzy similarity of two lowercased strings."""
+        return difflib.SequenceMatcher(None, a, b).ratio()
+
+    def _region(self, page, i, key, score):
+        """Build a Label Studio rectangle for OCR word ``i`` (percent of the page size)."""
+        x, y, w, h = page["ocr"].percent[i].tolist()
+        return {
+            "from_name": "rectangles",
+            "to_name": "pdf",
+            "type": "rectanglelabels",
+            "origin": "prediction",
+            "item_index": page["index"],  # assign to correct page
+            "score": round(score, 3),
+            "value": {
+                "x": x,
+                "y": y,
+                "width": w,
+                "height": h,
+                "rotation": 0,
+                "rectanglelabels": [key]
+            }
+        }
+
+    def _best_on_line(self, page, i, target, threshold):
+        """Best fuzzy match of ``target`` among the words on the line of word ``i``, as ``(score, index)``."""
+        best = (0.0, None)
+        if not target:
+            return best
+        ocr = page["ocr"]
+        for j in ocr.line_members(i).tolist():
+            score = self._similarity(target, ocr.text_lower[j])
+            if score > threshold and score > best[0]:
+                best = (score, j)
+        return best
+
+    def _match_properties(self, props, page, table, threshold=0.8):
+        """Match extracted properties to OCR blocks and collect region candidates.
+
+        Properties with a value are merged into the document's ``PropertyTable``
+        first (empty ones are dropped). Only the value is searched on the whole
+        page; every hit becomes a candidate with its context (name/unit on the
+        same OCR line) and similarity, plus the value/name/unit rectangles it
+        would emit. Which candidates are emitted is decided per document by
+        ``select_regions``.
+        """
+        ocr = page["ocr"]
+        candidates = []
+
+        for prop in props:
+            value_str = prop.get("prop-value", "").strip().lower()
+            if not value_str:
+                # Nothing to locate, and an empty value is not a property worth keeping
+                continue
+            record = table.add(prop, page["index"])
+            key = (record["name"], record["value"], record["unit"])
+
+            name_str = prop.get("prop-name", "").strip().lower()
+            unit_str = prop.get("prop-unit", "").strip().lower()
+            # OCR often glues value and unit into one word ("5000mAh")
+            value_targets = [value_str] + ([value_str + unit_str] if unit_str else [])
+
+            found = 0
+            for i in ocr.candidates(value_targets, threshold).tolist():
+                block_text = ocr.text_lower[i]
+                score = max(self._similarity(t, block_text) for t in value_targets)
+                if score <= threshold:
+                    continue
+                name_match = self._best_on_line(page, i, name_str, threshold)
+                unit_match = self._best_on_line(page, i, unit_str, threshold)
+                regions = [
+                    (page["index"], j, label, self._region(page, j, label, match_score))
+                    for label, (match_score, j) in (
+                        ("prop-value", (score, i)),
+                        ("prop-name", name_match),
+                        ("prop-unit", unit_match),
+                    )
+                    if j is not None
+                ]
+                candidates.append({
+                    "property": key,
+                    "context": (name_match[1] is not None) + (unit_match[1] is not None),
+                    "score": score,
+                    "page": page["index"],
+                    "word": i,
+                    "regions": regions,
+                })
+                found += 1
+
+            if found:
+                print(f"✅ Matched '{prop.get('prop-value')}' (page {page['index']}, {found} candidate(s))")
+
+        return candidates
+
+    def process_page(self, page_index, page_url, image_source=None, table=None, strict=False):
+        """Run OCR + LLM extraction + matching for a single page.
+
+        ``image_source`` lets headless callers OCR a local copy of the page while
+        the regions still refer to ``page_url``. ``table`` is the document's
+        ``PropertyTable`` shared by all its pages. Returns ``(props, candidates)``,
+        see ``select_regions`` for turning the candidates of a document into regions;
+        ``RateLimitError`` is propagated once all API keys are exhausted. OCR and
+        LLM errors leave the page empty, unless ``strict`` is set: then they are
+        raised so the caller can retry the page later.
+        """
+        table = table if table is not None else PropertyTable()
+        try:
+            # --- OCR ---
+            ocr = self._ocr_image(image_source or page_url)
+        except Exception as e:
+            print(f"❌ OCR failed for {page_url}: {e}")
+            if strict:
+                raise
+            return [], []
+
+        page = {"index": page_index, "ocr": ocr}
+
+        props, candidates = [], []
+        try:
+            # --- LLM Extraction, matching each property as soon as it is streamed ---
+            for prop in self._stream_properties(ocr.full_text(), strict=strict):
+                props.append(prop)
+                candidates.extend(self._match_properties([prop], page, table))
+        except _openai().RateLimitError:
+            raise
+        except Exception as e:
+            print(f"⚠️ LLM extraction failed for page {page_index}: {e}")
+            if strict:
+                raise
+
+        return props, candidates
 
     # -------------------------------
     # Prediction Section
@@ -153,7 +507,8 @@ class NewModel(LabelStudioMLBase):
 
         for task in tasks:
             pages = task.get("data", {}).get("pages", [])
-            results = []
+            candidates = []
+            table = PropertyTable()
 
             for page_index, page_url in enumerate(pages):
                 if stop_processing:
@@ -163,59 +518,16 @@ class NewModel(LabelStudioMLBase):
                 print(f"📄 Processing page {page_index + 1}/{len(pages)}: {page_url}")
 
                 try:
-                    # --- OCR ---
-                    full_text, text_blocks, (img_w, img_h) = self._ocr_image(page_url)
-                except Exception as e:
-                    print(f"❌ OCR failed for {page_url}: {e}")
-                    continue
-
-                try:
-                    # --- LLM Extraction ---
-                    props = self._ask_model_for_properties(full_text)
-                except RateLimitError:
+                    _, page_candidates = self.process_page(page_index, page_url, table=table)
+                except _openai().RateLimitError:
                     print("🚫 All keys exhausted — stopping predictions now.")
                     stop_processing = True
                     break
-                except Exception as e:
-                    print(f"⚠️ LLM extraction failed for page {page_index}: {e}")
-                    props = []
-
-                # --- Match properties to OCR text (multi-match enabled) ---
-                for prop in props:
-                    for key, value in prop.items():
-                        if not value:
-                            continue
-
-                        value_str = str(value).strip().lower()
-                        if not value_str:
-                            continue
-
-                        for block in text_blocks:
-                            block_text = block.get("text", "").strip().lower()
-                            if not block_text:
-                                continue
-
-                            # fuzzy similarity
-                            score = difflib.SequenceMatcher(None, value_str, block_text).ratio()
-                            if score > 0.8:
-                                x, y, w, h = block["bbox"]
-                                results.append({
-                                    "from_name": "rectangles",
-                                    "to_name": "pdf",
-                                    "type": "rectanglelabels",
-                                    "origin": "prediction",
-                                    "item_index": page_index,  # assign to correct page
-                                    "value": {
-                                        "x": (x / img_w) * 100,
-                                        "y": (y / img_h) * 100,
-                                        "width": (w / img_w) * 100,
-                                        "height": (h / img_h) * 100,
-                                        "rotation": 0,
-                                        "rectanglelabels": [key]
-                                    }
-                                })
-                                print(f"✅ Matched '{value}' as '{key}' (page {page_index}, score={score:.2f}) at ({x},{y})")
 
+                candidates.extend(page_candidates)
+
+            results = select_regions(candidates, self.max_regions_per_property, self.max_regions_per_task)
+            print(f"📋 Consolidated {len(table)} distinct properties, {len(results)} regions.")
             predictions.append({
                 "model_version": self.get("model_version"),
                 "result": results
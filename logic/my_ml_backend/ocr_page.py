@@ -0,0 +1,118 @@
+"""
+Columnar representation of the OCR result of one page.
+
+`pytesseract.image_to_data` returns a dict of Python lists with one entry per
+page/block/paragraph/line/word, most of them empty. Instead of turning that into
+a list of per-word dicts, `OcrPage` keeps only the words, as NumPy columns:
+bounding boxes, confidence, a line id, and the text (interned, plus a
+lowercased copy for matching). Filtering and the conversion to Label Studio
+percentages are vectorized.
+"""
+
+import io
+import sys
+
+import numpy as np
+
+
+def _line_ids(block_num, par_num, line_num):
+    """Pack Tesseract's (block, paragraph, line) numbers into one sortable int64 id."""
+    return (block_num.astype(np.int64) * 1_000_000) + (par_num.astype(np.int64) * 1_000) + line_num
+
+
+class OcrPage:
+    """Words of one OCR'd page as parallel NumPy arrays."""
+
+    COLUMNS = ("left", "top", "width", "height", "conf", "line")
+
+    def __init__(self, size, text, left, top, width, height, conf, line):
+        self.size = (int(size[0]), int(size[1]))
+        self.text = text              # object array of interned str
+        self.text_lower = np.array([sys.intern(t.lower()) for t in text], dtype=object)
+        self.length = np.fromiter((len(t) for t in text), dtype=np.int32, count=len(text))
+        self.left = left.astype(np.int32)
+        self.top = top.astype(np.int32)
+        self.width = width.astype(np.int32)
+        self.height = height.astype(np.int32)
+        self.conf = conf.astype(np.float32)
+        self.line = line.astype(np.int64)
+        self._percent = None
+        self._lines = None
+
+    @classmethod
+    def from_tesseract(cls, data, size, min_conf=0.0):
+        """Build a page from `image_to_data(..., output_type=Output.DICT)`.
+
+        Drops empty entries (the page/block/line level rows) and words below ``min_conf``.
+        """
+        text = np.char.strip(np.asarray(data["text"], dtype=str))
+        conf = np.asarray(data["conf"], dtype=np.float32)
+        keep = (text != "") & (conf >= min_conf)
+
+        column = lambda name: np.asarray(data[name], dtype=np.int64)[keep]
+        return cls(
+            size,
+            np.array([sys.intern(str(t)) for t in text[keep]], dtype=object),
+            column("left"),
+            column("top"),
+            column("width"),
+            column("height"),
+            conf[keep],
+            _line_ids(column("block_num"), column("par_num"), column("line_num")),
+        )
+
+    def __len__(self):
+        return len(self.text)
+
+    def full_text(self):
+        return "\n".join(self.text)
+
+    @property
+    def percent(self):
+        """``(n, 4)`` array of x, y, width, height in percent of the page size (computed once)."""
+        if self._percent is None:
+            img_w, img_h = self.size
+            boxes = np.stack([self.left, self.top, self.width, self.height], axis=1).astype(np.float64)
+            self._percent = boxes * (100.0 / np.array([img_w, img_h, img_w, img_h], dtype=np.float64))
+        return self._percent
+
+    def line_members(self, i):
+        """Indices of the words on the same OCR line as word ``i``."""
+        if self._lines is None:
+            order = np.argsort(self.line, kind="stable")
+            ids, starts = np.unique(self.line[order], return_index=True)
+            self._lines = dict(zip(ids.tolist(), np.split(order, starts[1:])))
+        return self._lines[int(self.line[i])]
+
+    def candidates(self, targets, threshold):
+        """Indices of words whose length allows a fuzzy ratio above ``threshold`` for any target.
+
+        `SequenceMatcher.ratio()` is at most ``2 * min(a, b) / (a + b)``, so most words
+        can be ruled out without running it.
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        for target in targets:
+            n = len(target)
+            if n:
+                mask |= 2.0 * np.minimum(self.length, n) / (self.length + n) > threshold
+        return np.flatnonzero(mask)
+
+    # -------------------------------
+    # Serialization
+    # -------------------------------
+    def to_bytes(self):
+        """Compact binary form (compressed ``.npz``), e.g. for caches."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            size=np.asarray(self.size),
+            text=np.asarray(self.text, dtype=str),
+            **{name: getattr(self, name) for name in self.COLUMNS},
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        with np.load(io.BytesIO(payload)) as data:
+            text = np.array([sys.intern(str(t)) for t in data["text"]], dtype=object)
+            return cls(tuple(data["size"]), text, *(data[name] for name in cls.COLUMNS))
@@ -0,0 +1,178 @@
+"""
+Local store shared by all worker processes of the ML backend.
+
+With several gunicorn workers every process has its own `NewModel` instances,
+so state that must be global (which API key is currently rate limited) and the
+OCR/LLM caches live in one SQLite file instead. SQLite in WAL mode handles
+concurrent readers and short writes from multiple processes without a
+separate service.
+
+    SHARED_STORE=/data/shared_store.sqlite3   # location of the store
+    CACHE_ENABLED=false                       # disable the OCR/LLM caches
+    CACHE_TTL_SECONDS=604800                  # cache entries expire after a week (0: never)
+    CACHE_MAX_MB=1024                         # oldest entries are evicted above this size (0: no cap)
+"""
+
+import os
+import sqlite3
+import tempfile
+import itertools
+import threading
+import time
+
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "ml_backend_shared_store.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS cache_created ON cache (created);
+"""
+
+
+class SharedStore:
+    """Key/value state and byte caches in a SQLite file shared between processes.
+
+    Cache entries older than ``ttl`` seconds are ignored and pruned; above
+    ``max_bytes`` the oldest entries are evicted. Pruning runs every
+    ``prune_every`` writes of this process (``None`` disables either limit).
+    """
+
+    def __init__(self, path=DEFAULT_PATH, timeout=30.0, ttl=None, max_bytes=None, prune_every=100):
+        self.path = path
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every
+        self._puts = itertools.count(1)
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        """Connection for the calling thread; a forked worker never reuses its parent's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # -------------------------------
+    # State
+    # -------------------------------
+    def get_state(self, key, default=None):
+        row = self._connect().execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_state(self, key, value):
+        self._connect().execute(
+            "INSERT INTO state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    def compare_and_set(self, key, expected, value):
+        """Set ``key`` to ``value`` only if it currently holds ``expected`` (``None``: not set yet).
+
+        Returns True if this call made the change.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+            current = row[0] if row else None
+            if current != (None if expected is None else str(expected)):
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT INTO state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value)),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # -------------------------------
+    # Caches
+    # -------------------------------
+    def _expired_before(self):
+        return time.time() - self.ttl if self.ttl else None
+
+    def cache_get(self, namespace, key):
+        row = self._connect().execute(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ? AND (? IS NULL OR created >= ?)",
+            (namespace, key, self._expired_before(), self._expired_before()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def cache_put(self, namespace, key, value):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, created) VALUES (?, ?, ?, ?)",
+            (namespace, key, value, time.time()),
+        )
+        if self.prune_every and next(self._puts) % self.prune_every == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop expired entries, then the oldest ones until the cache fits ``max_bytes``.
+
+        Returns the number of entries removed.
+        """
+        conn = self._connect()
+        removed = 0
+        expired_before = self._expired_before()
+        if expired_before is not None:
+            removed += conn.execute("DELETE FROM cache WHERE created < ?", (expired_before,)).rowcount
+        if self.max_bytes:
+            removed += conn.execute(
+                "DELETE FROM cache WHERE rowid IN ("
+                "  SELECT rowid FROM ("
+                "    SELECT rowid, SUM(length(value)) OVER (ORDER BY created DESC, rowid DESC) AS total"
+                "    FROM cache"
+                "  ) WHERE total > ?"
+                ")",
+                (self.max_bytes,),
+            ).rowcount
+        return removed
+
+    def cache_clear(self, namespace=None):
+        if namespace is None:
+            self._connect().execute("DELETE FROM cache")
+        else:
+            self._connect().execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide `SharedStore` at ``$SHARED_STORE``, with the cache limits from the environment."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            ttl = float(os.getenv("CACHE_TTL_SECONDS") or 7 * 24 * 3600)
+            max_mb = float(os.getenv("CACHE_MAX_MB") or 1024)
+            _store = SharedStore(
+                os.getenv("SHARED_STORE") or DEFAULT_PATH,
+                ttl=ttl or None,
+                max_bytes=int(max_mb * 1024 * 1024) or None,
+            )
+        return _store
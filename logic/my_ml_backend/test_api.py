@@ -12,6 +12,7 @@ Then execute `pytest` in the directory of this file.
 
 import pytest
 import json
+import os
 from model import NewModel
 
 
@@ -45,3 +46,23 @@ def test_predict(client):
     assert response.status_code == 200
     response = json.loads(response.data)
     assert response == expected_response
+
+
+def test_import_model_is_lazy():
+    """`import model` must not pull in the heavy dependencies (they are loaded on first use).
+
+    label_studio_ml is imported before the snapshot: `NewModel` subclasses it, so it is
+    needed at import time anyway (see the README's cold start section).
+    """
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, label_studio_ml.model, label_studio_ml.response; "
+        "before = set(sys.modules); import model; "
+        "print(sorted(m for m in ('openai', 'pytesseract', 'PIL', 'requests', 'numpy') "
+        "if m in sys.modules and m not in before))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,153 @@
+"""
+Tests for the headless batch runner. Run with `pytest` in this directory.
+"""
+
+import json
+import os
+import sys
+import types
+
+import pytest
+
+import batch
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+def make_library(root, out):
+    """Documents in every supported layout, plus two ids that sanitize to the same name."""
+    # data_json.json as a dict
+    touch(os.path.join(root, "phone", "phone_1.jpg"))
+    touch(os.path.join(root, "phone", "phone_2.jpg"))
+    write_json(os.path.join(root, "phone", "data_json.json"), {"data": {
+        "pdf_name": "Phone",
+        "pages": ["http://host/images/phone/phone_1.jpg", "http://host/images/phone/phone_2.jpg"],
+    }})
+    # data_json.json as a list of Label Studio tasks
+    touch(os.path.join(root, "tv", "tv_1.jpg"))
+    write_json(os.path.join(root, "tv", "data_json.json"), [{"data": {
+        "pages": ["http://host/images/tv/tv_1.jpg"],
+    }}])
+    # plain images, sorted naturally, and an id colliding with "a_b" after sanitizing
+    for n in (1, 2, 10):
+        touch(os.path.join(root, "a", "b", f"b_{n}.jpg"))
+    touch(os.path.join(root, "a_b", "x_1.jpg"))
+    # PDF only: pages were already rendered by an earlier run
+    touch(os.path.join(root, "manuals", "washer.pdf"))
+    doc_id = os.path.join("manuals", "washer")
+    touch(os.path.join(out, "pages", batch._document_key(doc_id), "washer_1.jpg"))
+
+
+class FakeModel:
+    """Stands in for NewModel: one property per page, optional failures per page URL."""
+
+    max_regions_per_property = 3
+    max_regions_per_task = 300
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+
+    def get(self, key):
+        return "test"
+
+    def process_page(self, page_index, page_url, image_source=None, table=None, strict=False):
+        self.calls.append(page_url)
+        if page_url in self.fail:
+            raise OSError("connection reset")
+        prop = {"prop-name": "Page", "prop-value": str(page_index + 1), "prop-unit": ""}
+        table.add(prop, page_index)
+        return [prop], []
+
+
+def test_discovery(tmp_path):
+    root, out = str(tmp_path / "lib"), str(tmp_path / "out")
+    make_library(root, out)
+
+    docs = {d["id"]: d for d in batch.discover_documents(root, out)}
+    assert set(docs) == {"phone", "tv", os.path.join("a", "b"), "a_b", os.path.join("manuals", "washer")}
+
+    assert docs["phone"]["name"] == "Phone"
+    assert docs["phone"]["pages"][0] == (
+        "http://host/images/phone/phone_1.jpg", os.path.join(root, "phone", "phone_1.jpg"))
+    assert docs["tv"]["name"] == "tv"
+    assert [os.path.basename(p) for _, p in docs[os.path.join("a", "b")]["pages"]] == ["b_1.jpg", "b_2.jpg", "b_10.jpg"]
+    assert len(docs[os.path.join("manuals", "washer")]["pages"]) == 1
+
+    assert batch._document_key(os.path.join("a", "b")) != batch._document_key("a_b")
+
+
+def test_failed_pages_are_retried_on_resume(tmp_path):
+    root, out = str(tmp_path / "lib"), str(tmp_path / "out")
+    make_library(root, out)
+
+    first = FakeModel(fail={"http://host/images/phone/phone_2.jpg"})
+    assert batch.run(root, out, concurrency=2, model=first) == 4
+    assert batch.load_checkpoint(out) == {"tv", os.path.join("a", "b"), "a_b", os.path.join("manuals", "washer")}
+    assert len(os.listdir(os.path.join(out, "properties"))) == 4
+
+    second = FakeModel()
+    assert batch.run(root, out, concurrency=2, model=second) == 1
+    assert sorted(second.calls) == ["http://host/images/phone/phone_1.jpg", "http://host/images/phone/phone_2.jpg"]
+    assert "phone" in batch.load_checkpoint(out)
+
+    with open(os.path.join(out, "properties", batch._document_key("phone") + ".jsonl"), encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert [(r["value"], r["pages"]) for r in rows] == [("1", [0]), ("2", [1])]
+
+    with open(os.path.join(out, "tasks", batch._document_key("phone") + ".json"), encoding="utf-8") as f:
+        task = json.load(f)[0]
+    assert task["data"]["pdf_name"] == "Phone"
+    assert task["predictions"][0]["model_version"] == "test"
+
+    # Nothing left to do
+    assert batch.run(root, out, model=FakeModel()) == 0
+
+
+class FakeImage:
+    def save(self, path, fmt):
+        with open(path, "wb") as f:
+            f.write(b"jpeg")
+
+
+def test_interrupted_pdf_render_is_redone(tmp_path, monkeypatch):
+    root, out = str(tmp_path / "lib"), str(tmp_path / "out")
+    touch(os.path.join(root, "manuals", "dryer.pdf"))
+
+    def interrupted(path):
+        yield FakeImage()
+        raise KeyboardInterrupt("stopped while rendering page 2")
+
+    pdf2image = types.ModuleType("pdf2image")
+    monkeypatch.setitem(sys.modules, "pdf2image", pdf2image)
+
+    pdf2image.convert_from_path = interrupted
+    try:
+        batch.run(root, out, model=FakeModel())
+    except KeyboardInterrupt:
+        pass
+    assert batch.load_checkpoint(out) == set()
+
+    pdf2image.convert_from_path = lambda path: [FakeImage() for _ in range(3)]
+    model = FakeModel()
+    assert batch.run(root, out, model=model) == 1
+    assert sorted(os.path.basename(url) for url in model.calls) == ["dryer_1.jpg", "dryer_2.jpg", "dryer_3.jpg"]
+
+
+def test_parquet_without_pyarrow_fails_before_processing(tmp_path, monkeypatch):
+    root, out = str(tmp_path / "lib"), str(tmp_path / "out")
+    make_library(root, out)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    model = FakeModel()
+    with pytest.raises(ImportError, match="pyarrow"):
+        batch.run(root, out, fmt="parquet", model=model)
+    assert model.calls == []
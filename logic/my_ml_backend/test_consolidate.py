@@ -0,0 +1,76 @@
+"""
+Tests for property consolidation. Run with `pytest` in this directory.
+"""
+
+from consolidate import PropertyTable, normalize_name, normalize_value_unit, select_regions
+
+
+def test_normalize_name_synonyms():
+    assert normalize_name("Wi-Fi") == "wifi"
+    assert normalize_name("  Battery_Capacity: ") == "battery"
+
+
+def test_unit_conversion():
+    assert normalize_value_unit("5", "Ah") == ("5000", "mah")
+    assert normalize_value_unit("0,5", "Meters") == ("500", "mm")
+    assert normalize_value_unit("1920 x 1080", "") == ("1920 x 1080", "")
+    assert normalize_value_unit("2.4", "GHz") == ("2400000000", "hz")
+    assert normalize_value_unit("512", "MB") == ("0.512", "gb")
+    # Thousands separators are not decimal commas
+    assert normalize_value_unit("1,024", "MB") == ("1.024", "gb")
+    assert normalize_value_unit("1,500", "kg") == ("1500000", "g")
+    assert normalize_value_unit("1,500", "kg") != normalize_value_unit("1.5", "kg")
+    assert normalize_value_unit("2,048.5", "MB") == ("2.0485", "gb")
+    assert normalize_value_unit("1,5", "kg") == ("1500", "g")
+    # Ambiguous: left unconverted
+    assert normalize_value_unit("1.234,5", "kg") == ("1.234,5", "kg")
+
+
+def test_long_numbers_stay_distinct():
+    assert normalize_value_unit("1234567", "") == ("1234567", "")
+    assert normalize_value_unit("1234567", "kg") != normalize_value_unit("1234568", "kg")
+
+    table = PropertyTable()
+    table.add({"prop-name": "Serial", "prop-value": "1234567", "prop-unit": ""}, 0)
+    table.add({"prop-name": "Serial", "prop-value": "1234568", "prop-unit": ""}, 0)
+    assert [row["value"] for row in table.rows()] == ["1234567", "1234568"]
+
+
+def test_table_merges_duplicates_with_provenance():
+    table = PropertyTable()
+    table.add({"prop-name": "Battery capacity", "prop-value": "5", "prop-unit": "Ah"}, 3)
+    table.add({"prop-name": "battery", "prop-value": "5000", "prop-unit": "mAh"}, 7)
+    table.add({"prop-name": "Weight", "prop-value": "180", "prop-unit": "g"}, 3)
+
+    rows = table.rows()
+    assert len(rows) == 2
+    assert rows[0]["name"] == "battery"
+    assert rows[0]["pages"] == [3, 7]
+    assert rows[0]["occurrences"] == 2
+
+
+def candidate(prop, context, score, page, word):
+    region = {"item_index": page, "score": score, "word": word}
+    return {"property": prop, "context": context, "score": score, "page": page, "word": word,
+            "regions": [(page, word, "prop-value", region)]}
+
+
+def test_select_regions_ranks_per_document():
+    weight, size = ("weight", "1000", "g"), ("size", "5", "")
+    candidates = [
+        # Arrival order (the order pages finished in) must not matter
+        candidate(weight, 0, 1.0, 0, 4),
+        candidate(weight, 1, 0.9, 5, 2),
+        candidate(weight, 2, 0.85, 9, 1),
+        candidate(weight, 1, 0.95, 3, 7),
+        candidate(size, 0, 0.9, 2, 3),
+        candidate(size, 0, 0.9, 1, 8),
+    ]
+
+    regions = select_regions(candidates, per_property=2, per_task=10)
+    # Best two weights by context, then score (the bare hit on page 0 is dropped); both sizes; page order
+    assert [(r["item_index"], r["word"]) for r in regions] == [(1, 8), (2, 3), (3, 7), (9, 1)]
+    assert select_regions(list(reversed(candidates)), per_property=2, per_task=10) == regions
+
+    capped = select_regions(candidates, per_property=2, per_task=2)
+    assert [(r["item_index"], r["word"]) for r in capped] == [(1, 8), (3, 7)]
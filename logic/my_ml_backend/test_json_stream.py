@@ -0,0 +1,50 @@
+"""
+Tests for the incremental LLM output parser. Run with `pytest` in this directory.
+"""
+
+import json
+from json_stream import PropertyStreamParser, parse_properties
+
+
+PROPS = [
+    {"prop-name": "Battery", "prop-value": "5000", "prop-unit": "mAh"},
+    {"prop-name": "Screen size", "prop-value": "6.2", "prop-unit": "inch"},
+]
+
+
+def test_parse_with_chatter():
+    text = "Sure! Here is the list:\n" + json.dumps(PROPS) + "\nLet me know if {you need} more."
+    assert parse_properties(text) == PROPS
+
+
+def test_parse_json_mode_wrapper():
+    assert parse_properties(json.dumps({"properties": PROPS})) == PROPS
+
+
+def test_truncated_output_keeps_complete_items():
+    text = json.dumps(PROPS)[:-20]
+    assert parse_properties(text) == PROPS[:1]
+
+
+def test_items_are_emitted_while_streaming():
+    text = json.dumps(PROPS)
+    parser = PropertyStreamParser()
+    emitted = []
+    for i in range(0, len(text), 7):
+        emitted.append(parser.feed(text[i:i + 7]))
+
+    assert [item for chunk in emitted for item in chunk] == PROPS
+    # the first property is available before the stream is finished
+    first_done = next(i for i, chunk in enumerate(emitted) if chunk)
+    assert first_done < len(emitted) - 1
+
+
+def test_braces_and_escapes_inside_strings():
+    props = [{"prop-name": "Note {a}", "prop-value": "say \"}\"", "prop-unit": ""}]
+    assert parse_properties(json.dumps(props)) == props
+
+
+def test_empty_and_non_property_objects_are_skipped():
+    assert parse_properties('{"properties": []}') == []
+    assert parse_properties('{} {"properties": "[]"} {"note": "none"}') == []
+    assert parse_properties('[{"prop-name": "Ports", "prop-value": ["USB", "HDMI"]}]') == []
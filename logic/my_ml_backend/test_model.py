@@ -0,0 +1,160 @@
+"""
+Tests for the LLM streaming in `NewModel._stream_properties`, with a stub
+OpenAI client (no endpoint, no `/predict` app). Run with `pytest` in this directory.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("label_studio_ml")
+openai = pytest.importorskip("openai")
+httpx = pytest.importorskip("httpx")
+
+import model
+from shared_store import SharedStore
+
+
+def chunk(content=None, finish_reason=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content),
+                                                    finish_reason=finish_reason)])
+
+
+def api_error(cls, status, message):
+    request = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+    return cls(message, response=httpx.Response(status, request=request), body=None)
+
+
+class StubClient:
+    """Plays back one answer per `create` call: a list of chunks/exceptions, or an exception."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return self._stream(answer)
+
+    @staticmethod
+    def _stream(answer):
+        for part in answer:
+            if isinstance(part, Exception):
+                raise part
+            yield part
+
+
+@pytest.fixture
+def make_model(tmp_path, monkeypatch):
+    store = SharedStore(str(tmp_path / "store.sqlite3"))
+    store.set_state("api_key_index", 0)
+    monkeypatch.setattr(model, "get_store", lambda: store)
+
+    def make(*clients, json_mode=True, cache_enabled=True):
+        keys = [f"key{i}" for i in range(len(clients))]
+        by_key = dict(zip(keys, clients))
+        monkeypatch.setattr(model, "get_client", lambda api_key, base_url: by_key[api_key])
+
+        m = model.NewModel.__new__(model.NewModel)  # no setup(): only what streaming needs
+        m.api_keys = keys
+        m.current_key_index = 0
+        m.key_reset_seconds = 3600
+        m._key_lock = threading.Lock()
+        m.base_url = "http://llm.test/v1"
+        m.model_name = "test-model"
+        m.json_mode = json_mode
+        m.cache_enabled = cache_enabled
+        return m
+
+    return make
+
+
+ANSWER = [
+    chunk('{"properties": [{"prop-name": " Weight ", "prop-'),
+    chunk('value": 180, "prop-unit": null}, {"prop-name": "Color", '),
+    chunk('"prop-value": "black", "prop-unit": ""}]}'),
+    chunk(finish_reason="stop"),
+]
+WEIGHT = {"prop-name": "Weight", "prop-value": "180", "prop-unit": ""}
+COLOR = {"prop-name": "Color", "prop-value": "black", "prop-unit": ""}
+
+
+def test_values_are_normalized_and_complete_answers_cached(make_model):
+    client = StubClient(ANSWER)
+    m = make_model(client)
+
+    assert list(m._stream_properties("page text")) == [WEIGHT, COLOR]
+    assert client.requests[0]["response_format"] == {"type": "json_object"}
+    # Second call is served from the cache
+    assert list(m._stream_properties("page text")) == [WEIGHT, COLOR]
+    assert len(client.requests) == 1
+
+
+def test_truncated_or_empty_answers_are_not_cached(make_model):
+    truncated = ANSWER[:2] + [chunk(finish_reason="length")]
+    empty = [chunk('{"properties": []}'), chunk(finish_reason="stop")]
+    client = StubClient(truncated, empty, ANSWER)
+    m = make_model(client)
+
+    assert list(m._stream_properties("page text")) == [WEIGHT]
+    assert list(m._stream_properties("page text")) == []
+    assert list(m._stream_properties("page text")) == [WEIGHT, COLOR]
+    assert len(client.requests) == 3
+
+
+def test_json_mode_falls_back_only_for_response_format_errors(make_model):
+    rejected = api_error(openai.BadRequestError, 400, "response_format json_object is not supported")
+    client = StubClient(rejected, [chunk('[{"prop-name": "Color", "prop-value": "black"}]'),
+                                   chunk(finish_reason="stop")])
+    m = make_model(client)
+
+    assert list(m._stream_properties("page text")) == [{"prop-name": "Color", "prop-value": "black"}]
+    assert m.json_mode is False
+    assert "response_format" not in client.requests[1]
+    assert "pure JSON list" in client.requests[1]["messages"][1]["content"]
+
+    too_long = api_error(openai.BadRequestError, 400, "maximum context length is 8192 tokens")
+    m = make_model(StubClient(too_long))
+    with pytest.raises(openai.BadRequestError):
+        list(m._stream_properties("a very long page", strict=True))
+    assert m.json_mode is True
+
+
+def test_rate_limit_retry_with_next_key_keeps_every_property(make_model):
+    limited = api_error(openai.RateLimitError, 429, "rate limit exceeded")
+    first = StubClient([ANSWER[0], ANSWER[1], limited])
+    # The new key's answer differs in order and content
+    second = StubClient([
+        chunk('[{"prop-name": "Color", "prop-value": "black", "prop-unit": ""}, '),
+        chunk('{"prop-name": "Weight", "prop-value": "180", "prop-unit": ""}, '),
+        chunk('{"prop-name": "Depth", "prop-value": "60", "prop-unit": "cm"}]'),
+        chunk(finish_reason="stop"),
+    ])
+    m = make_model(first, second, json_mode=False)
+
+    items = list(m._stream_properties("page text"))
+    assert items == [WEIGHT, COLOR, {"prop-name": "Depth", "prop-value": "60", "prop-unit": "cm"}]
+    assert m.current_key_index == 1
+
+
+def test_all_keys_exhausted_raises(make_model):
+    limited = api_error(openai.RateLimitError, 429, "rate limit exceeded")
+    m = make_model(StubClient(limited))
+    with pytest.raises(openai.RateLimitError):
+        list(m._stream_properties("page text"))
+
+
+def test_strict_raises_broken_streams(make_model):
+    broken = [ANSWER[0], ANSWER[1], ConnectionError("stream reset")]
+
+    m = make_model(StubClient(broken), cache_enabled=False)
+    assert list(m._stream_properties("page text")) == [WEIGHT]
+
+    m = make_model(StubClient(broken), cache_enabled=False)
+    with pytest.raises(ConnectionError):
+        list(m._stream_properties("page text", strict=True))
@@ -0,0 +1,56 @@
+"""
+Tests for the columnar OCR page. Run with `pytest` in this directory.
+"""
+
+import numpy as np
+from ocr_page import OcrPage
+
+
+WORDS = [("Battery", 1, 95), ("5000", 1, 91), ("mAh", 1, 30), ("Weight", 2, 88), ("180", 2, 90)]
+
+
+def tesseract_dict():
+    """Shape of `image_to_data(..., output_type=Output.DICT)`, including the empty non-word rows."""
+    n = len(WORDS)
+    return {
+        "text": ["", " "] + [w for w, _, _ in WORDS],
+        "conf": [-1, -1] + [c for _, _, c in WORDS],
+        "left": [0, 0] + [i * 50 for i in range(n)],
+        "top": [0, 0] + [line * 20 for _, line, _ in WORDS],
+        "width": [200, 200] + [40] * n,
+        "height": [100, 20] + [10] * n,
+        "block_num": [0, 1] + [1] * n,
+        "par_num": [0, 1] + [1] * n,
+        "line_num": [0, 0] + [line for _, line, _ in WORDS],
+    }
+
+
+def test_empty_entries_and_low_confidence_are_dropped():
+    page = OcrPage.from_tesseract(tesseract_dict(), (200, 100))
+    assert list(page.text) == [w for w, _, _ in WORDS]
+    assert list(page.text_lower)[:2] == ["battery", "5000"]
+
+    page = OcrPage.from_tesseract(tesseract_dict(), (200, 100), min_conf=50)
+    assert "mAh" not in list(page.text)
+
+
+def test_percent_boxes_and_lines():
+    page = OcrPage.from_tesseract(tesseract_dict(), (200, 100))
+    np.testing.assert_allclose(page.percent[1], [25.0, 20.0, 20.0, 10.0])
+    assert page.line_members(0).tolist() == [0, 1, 2]
+    assert page.line_members(4).tolist() == [3, 4]
+
+
+def test_length_prefilter():
+    page = OcrPage.from_tesseract(tesseract_dict(), (200, 100))
+    # "Battery" and "Weight" are too long to ever reach a ratio above 0.8 with "5000"
+    assert page.candidates(["5000"], 0.8).tolist() == [1, 2, 4]
+
+
+def test_bytes_roundtrip():
+    page = OcrPage.from_tesseract(tesseract_dict(), (200, 100))
+    copy = OcrPage.from_bytes(page.to_bytes())
+    assert copy.size == page.size
+    assert list(copy.text) == list(page.text)
+    np.testing.assert_array_equal(copy.percent, page.percent)
+    np.testing.assert_array_equal(copy.line, page.line)
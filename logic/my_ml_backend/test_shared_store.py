@@ -0,0 +1,70 @@
+"""
+Tests for the store shared between worker processes. Run with `pytest` in this directory.
+"""
+
+import multiprocessing
+
+from shared_store import SharedStore
+
+
+def test_state_and_compare_and_set(tmp_path):
+    store = SharedStore(str(tmp_path / "store.sqlite3"))
+    assert store.get_state("api_key_index") is None
+
+    assert store.compare_and_set("api_key_index", None, 0)
+    assert not store.compare_and_set("api_key_index", None, 5)
+    assert store.compare_and_set("api_key_index", 0, 1)
+    assert not store.compare_and_set("api_key_index", 0, 1)
+    assert store.get_state("api_key_index") == "1"
+
+
+def test_cache(tmp_path):
+    store = SharedStore(str(tmp_path / "store.sqlite3"))
+    assert store.cache_get("ocr", "page") is None
+
+    store.cache_put("ocr", "page", b"\x00columns")
+    assert store.cache_get("ocr", "page") == b"\x00columns"
+    assert store.cache_get("llm", "page") is None
+
+    store.cache_clear("ocr")
+    assert store.cache_get("ocr", "page") is None
+
+
+def test_cache_ttl(tmp_path):
+    store = SharedStore(str(tmp_path / "store.sqlite3"), ttl=60)
+    store.cache_put("ocr", "old", b"stale")
+    store._connect().execute("UPDATE cache SET created = created - 120 WHERE key = 'old'")
+    store.cache_put("ocr", "new", b"fresh")
+
+    assert store.cache_get("ocr", "old") is None
+    assert store.prune() == 1
+    assert store.cache_get("ocr", "new") == b"fresh"
+
+
+def test_cache_size_cap_evicts_oldest(tmp_path):
+    store = SharedStore(str(tmp_path / "store.sqlite3"), max_bytes=25, prune_every=2)
+    for i in range(3):
+        store.cache_put("ocr", f"page{i}", bytes(10))
+        store._connect().execute("UPDATE cache SET created = ? WHERE key = ?", (i, f"page{i}"))
+    store.cache_put("llm", "page3", bytes(10))  # 4th write prunes
+
+    assert [store.cache_get("ocr", f"page{i}") is not None for i in range(3)] == [False, False, True]
+    assert store.cache_get("llm", "page3") == bytes(10)
+
+
+def _rotate(path, results):
+    results.put(SharedStore(path).compare_and_set("api_key_index", 0, 1))
+
+
+def test_only_one_process_rotates_the_key(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    SharedStore(path).set_state("api_key_index", 0)
+
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_rotate, args=(path, results)) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert sorted(results.get() for _ in workers) == [False, False, False, True]